@@ -0,0 +1,243 @@
+# Benchmarks reproductibles du cœur de la liste de tâches (todo_core), sans interface.
+#
+#   python benchmark.py --sizes 1000 10000 --output avant.json
+#   python benchmark.py --sizes 1000 10000 --output apres.json --compare avant.json
+#
+# Les fichiers de tâches synthétiques sont générés une seule fois dans --data-dir
+# (même graine, mêmes tâches d'une exécution à l'autre). Le rafraîchissement du
+# tableau est mesuré sur un Treeview factice, ou sur un vrai ttk.Treeview avec
+# --tk (il faut alors un affichage, par exemple Xvfb).
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+from todo_core import Task, TaskStore, TaskStorage, SqliteTaskStore, sync_rows
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+# Nombre de lignes visibles dans le tableau de l'application
+VISIBLE_ROWS = 20
+
+SEARCH_TERM = "budget"
+WEEK = ("2025-06-02", "2025-06-08")
+
+WORDS = ["rapport", "réunion", "client", "courses", "dentiste", "budget", "relecture",
+         "appel", "courriel", "projet", "facture", "présentation", "équipe", "planning"]
+
+def generate_tasks(count, seed=0):
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    for index in range(count):
+        task = Task(
+            title=" ".join(rng.choices(WORDS, k=3)).capitalize(),
+            description=" ".join(rng.choices(WORDS, k=rng.randint(0, 12))),
+            completed=rng.random() < 0.3,
+            task_id=f"{index:032x}"
+        )
+        task.due_date_str = (start + timedelta(days=rng.randrange(730))).isoformat()
+        yield task
+
+def task_file(data_dir, size):
+    filename = os.path.join(data_dir, f"tasks-{size}.json")
+    if not os.path.exists(filename):
+        TaskStorage(filename).compact(generate_tasks(size))
+    return filename
+
+def database_file(data_dir, size):
+    filename = os.path.join(data_dir, f"tasks-{size}.db")
+    if not os.path.exists(filename):
+        SqliteTaskStore(filename, import_from=TaskStorage(task_file(data_dir, size))).close()
+    return filename
+
+# Remplace ttk.Treeview : compte les appels qui traverseraient vers Tcl
+class StubTree:
+
+    def __init__(self):
+        self.calls = 0
+
+    def insert(self, parent, index, iid, values, tags):
+        self.calls += 1
+
+    def move(self, iid, parent, index):
+        self.calls += 1
+
+    def item(self, iid, values, tags):
+        self.calls += 1
+
+    def delete(self, *iids):
+        self.calls += 1
+
+def make_tree_factory(use_tk):
+    if not use_tk:
+        return StubTree
+    import tkinter as tk
+    from tkinter import ttk
+    root = tk.Tk()
+    root.withdraw()
+
+    def factory():
+        tree = ttk.Treeview(root, columns=("title", "description", "due_date", "status"), show="headings")
+        tree.tag_configure("completed", foreground="#95a5a6")
+        return tree
+    return factory
+
+def release(argument):
+    # Un vrai Treeview est détruit après sa mesure, pour ne pas garder tous ceux de --repeat en mémoire
+    destroy = getattr(argument, "destroy", None)
+    if destroy is not None:
+        destroy()
+
+def measure(function, repeat, trace_memory, setup=None):
+    # Meilleur temps sur repeat exécutions, puis pic mémoire d'une exécution de plus ;
+    # setup prépare hors mesure l'argument passé à function
+    best = float("inf")
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        function(argument) if setup else function()
+        best = min(best, time.perf_counter() - start)
+        release(argument)
+    peak = None
+    if trace_memory:
+        argument = setup() if setup else None
+        tracemalloc.start()
+        function(argument) if setup else function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        release(argument)
+    return best, peak
+
+def window(results):
+    len(results)
+    return results[:VISIBLE_ROWS]
+
+def json_operations(data_dir, size, tree_factory):
+    filename = task_file(data_dir, size)
+    store = TaskStore(TaskStorage(filename).load())
+    store.build_index()
+    store.due_index.build()
+    scratch = TaskStorage(os.path.join(data_dir, f"scratch-{size}.json"))
+    task = store.tasks[size // 2]
+
+    def toggle(_):
+        task.completed = not task.completed
+        store.update(task)
+        scratch.append({task.id: task.to_dict()})
+    
+    def reset_scratch():
+        # Chaque exécution part d'un journal vide au lieu de l'allonger indéfiniment
+        if os.path.exists(scratch.journal_filename):
+            os.remove(scratch.journal_filename)
+    
+    def forget_search():
+        # Sans cela, les exécutions suivantes affineraient le résultat gardé de la précédente
+        store.search_index.last = None
+
+    return [
+        ("load", lambda: TaskStore(TaskStorage(filename).load()), None),
+        ("save_snapshot", lambda: scratch.compact(store.tasks), None),
+        ("index_build", lambda: TaskStore(store.tasks).build_index(), None),
+        ("due_index_build", lambda: TaskStore(store.tasks).due_index.build(), None),
+        ("search", lambda _: window(store.query(SEARCH_TERM)), forget_search),
+        ("status_filter", lambda: window(store.query(completed=False)), None),
+        ("date_filter", lambda: window(store.query(date_range=WEEK)), None),
+        ("sort_due_date", lambda: window(store.query(sort="due_date")), None),
+        ("mutation", toggle, reset_scratch),
+        ("refresh_window", lambda tree: sync_rows(tree, {}, store.tasks[:VISIBLE_ROWS]), tree_factory),
+        ("refresh_full", lambda tree: sync_rows(tree, {}, store.tasks), tree_factory),
+    ]
+
+def sqlite_operations(data_dir, size, tree_factory):
+    filename = database_file(data_dir, size)
+    store = SqliteTaskStore(filename)
+    task = store.query()[size // 2]
+    # Les modifications vont dans une copie : la base de --data-dir reste celle générée
+    scratch_filename = os.path.join(data_dir, f"scratch-{size}.db")
+    source, target = sqlite3.connect(filename), sqlite3.connect(scratch_filename)
+    source.backup(target)
+    source.close()
+    target.close()
+    scratch = SqliteTaskStore(scratch_filename)
+
+    def toggle():
+        task.completed = not task.completed
+        scratch.update(task)
+
+    return [
+        ("load", lambda: window(SqliteTaskStore(filename).query()), None),
+        ("search", lambda: window(store.query(SEARCH_TERM)), None),
+        ("status_filter", lambda: window(store.query(completed=False)), None),
+        ("date_filter", lambda: window(store.query(date_range=WEEK)), None),
+        ("sort_due_date", lambda: window(store.query(sort="due_date")), None),
+        ("mutation", toggle, None),
+        ("refresh_window", lambda tree: sync_rows(tree, {}, store.query()[:VISIBLE_ROWS]), tree_factory),
+    ]
+
+BACKENDS = {"json": json_operations, "sqlite": sqlite_operations}
+
+def compare(results, baseline_filename, threshold):
+    with open(baseline_filename, "r", encoding="utf-8") as f:
+        baseline = {(r["backend"], r["size"], r["operation"]): r for r in json.load(f)["results"]}
+    print(f"\nComparaison avec {baseline_filename} :")
+    regressions = 0
+    for result in results:
+        previous = baseline.get((result["backend"], result["size"], result["operation"]))
+        if previous is None or not previous["seconds"]:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        marker = "  <-- plus lent" if ratio > 1 + threshold else ""
+        regressions += bool(marker)
+        print(f"{result['backend']:>6} {result['size']:>8} {result['operation']:<16} "
+              f"{previous['seconds'] * 1000:10.2f} ms -> {result['seconds'] * 1000:10.2f} ms  x{ratio:.2f}{marker}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de chargement, enregistrement, recherche, filtres et rafraîchissement")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "todo-benchmark"))
+    parser.add_argument("--no-memory", action="store_true", help="ne pas mesurer le pic mémoire (tracemalloc)")
+    parser.add_argument("--tk", action="store_true", help="rafraîchir un vrai ttk.Treeview au lieu du Treeview factice")
+    parser.add_argument("--output", help="fichier JSON où écrire les résultats")
+    parser.add_argument("--compare", help="résultats JSON d'une exécution précédente")
+    parser.add_argument("--threshold", type=float, default=0.10, help="ralentissement signalé par --compare (0.10 = 10 %%)")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    tree_factory = make_tree_factory(args.tk)
+
+    results = []
+    for size in args.sizes:
+        for backend in args.backends:
+            for operation, function, setup in BACKENDS[backend](args.data_dir, size, tree_factory):
+                seconds, peak = measure(function, args.repeat, not args.no_memory, setup)
+                results.append({"backend": backend, "size": size, "operation": operation,
+                                "seconds": seconds, "peak_bytes": peak})
+                peak_text = f"{peak / 1024 / 1024:9.1f} Mo" if peak is not None else ""
+                print(f"{backend:>6} {size:>8} {operation:<16} {seconds * 1000:10.2f} ms {peak_text}", flush=True)
+
+    if args.output:
+        meta = {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "tree": "tk" if args.tk else "stub",
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# Tests du cœur de la liste de tâches (todo_core), sans interface graphique.
+#
+#   python -m pytest test_todo_core.py
+#   python -m unittest test_todo_core
+import io
+import itertools
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from todo_core import Task, TaskStore, TaskStorage, SqliteTaskStore, iter_json_array, sync_rows
+
+WORDS = ["rapport", "Réunion", "client", "courses", "budget", "appel", "projet", "facture", "équipe"]
+
+def make_tasks(count, seed=0):
+    rng = random.Random(seed)
+    tasks = []
+    for index in range(count):
+        task = Task(
+            title=" ".join(rng.choices(WORDS, k=3)).capitalize(),
+            description=" ".join(rng.choices(WORDS, k=rng.randint(0, 6))),
+            completed=rng.random() < 0.3,
+            task_id=f"{index:032x}"
+        )
+        task.due_date_str = rng.choice([None, f"2025-01-0{rng.randint(1, 9)}", f"2025-02-1{rng.randint(0, 9)}"])
+        tasks.append(task)
+    return tasks
+
+class IterJsonArrayTest(unittest.TestCase):
+    
+    def parse(self, text, chunk_size):
+        return list(iter_json_array(io.StringIO(text), chunk_size))
+    
+    def test_every_chunk_size(self):
+        # Chaque coupure possible : au milieu d'une chaîne, d'un objet ou d'un nombre ("1" de 1.5, "12" de 123456)
+        items = [123456, 1.5, -2e3, "é, ]", {"a": [1, {"b": None}]}, [], True, 0]
+        text = json.dumps(items, ensure_ascii=False, indent=1)
+        for chunk_size in range(1, len(text) + 1):
+            self.assertEqual(self.parse(text, chunk_size), items, chunk_size)
+    
+    def test_empty_list(self):
+        self.assertEqual(self.parse("  [ ]\n", 1), [])
+        self.assertEqual(self.parse("", 4), [])
+    
+    def test_not_a_list(self):
+        with self.assertRaises(ValueError):
+            self.parse('{"title": "x"}', 4)
+    
+    def test_incomplete_list(self):
+        for text in ("[1, 2", '[{"title": "x"', "[1,"):
+            with self.assertRaises(ValueError):
+                self.parse(text, 3)
+
+class TaskStorageTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.storage = TaskStorage(os.path.join(self.directory, "tasks.json"))
+    
+    def test_journal_replay(self):
+        first, second, third = make_tasks(3)
+        self.storage.compact([first, second])
+        first.title = "Modifiée"
+        added = Task("Nouvelle", task_id="new")
+        self.storage.append({first.id: first.to_dict()})
+        self.storage.append({second.id: None, added.id: added.to_dict()})
+        # Le dernier état d'une tâche dans le journal l'emporte
+        first.completed = not first.completed
+        self.storage.append({first.id: first.to_dict()})
+        
+        tasks = self.storage.load()
+        self.assertEqual([task.to_dict() for task in tasks], [first.to_dict(), added.to_dict()])
+        self.assertTrue(self.storage.journal_intact)
+        
+        # La compaction fusionne le journal sans rien changer au résultat
+        self.storage.compact()
+        self.assertEqual(self.storage.journal_size(), 0)
+        self.assertEqual([task.to_dict() for task in self.storage.load()], [first.to_dict(), added.to_dict()])
+    
+    def test_truncated_last_line(self):
+        first, second = make_tasks(2)
+        self.storage.compact([first, second])
+        first.title = "Enregistrée"
+        self.storage.append({first.id: first.to_dict()})
+        with open(self.storage.journal_filename, "a", encoding="utf-8") as f:
+            f.write('{"op": "delete", "id": "' + second.id[:10])
+        
+        tasks = self.storage.load()
+        self.assertEqual([task.to_dict() for task in tasks], [first.to_dict(), second.to_dict()])
+        self.assertFalse(self.storage.journal_intact)
+        self.assertTrue(self.storage.needs_compaction())
+        
+        self.storage.compact(tasks)
+        self.assertTrue(self.storage.journal_intact)
+        self.storage.load()
+        self.assertTrue(self.storage.journal_intact)
+    
+    def test_file_without_ids(self):
+        # Ancien tasks.json : les ids sont dérivés de la position et stables d'une lecture à l'autre
+        old = [{"title": f"Tâche {index}", "description": "", "due_date": None, "completed": False} for index in range(3)]
+        with open(self.storage.filename, "w", encoding="utf-8") as f:
+            json.dump(old, f)
+        
+        tasks = self.storage.load()
+        self.assertEqual([task.title for task in tasks], ["Tâche 0", "Tâche 1", "Tâche 2"])
+        self.assertEqual([task.id for task in tasks], [task.id for task in self.storage.load()])
+        self.assertEqual(len({task.id for task in tasks}), 3)
+        
+        # Une modification journalisée s'applique bien à la tâche sans id d'origine
+        tasks[1].completed = True
+        self.storage.append({tasks[1].id: tasks[1].to_dict(), tasks[2].id: None})
+        self.assertEqual([(task.title, task.completed) for task in self.storage.load()],
+                         [("Tâche 0", False), ("Tâche 1", True)])
+
+# Treeview factice qui garde l'ordre et le contenu des lignes
+class FakeTree:
+    
+    def __init__(self):
+        self.order = []
+        self.rows = {}
+        self.calls = []
+    
+    def insert(self, parent, index, iid, values, tags):
+        self.calls.append("insert")
+        self.order.insert(index, iid)
+        self.rows[iid] = (values, tags)
+    
+    def move(self, iid, parent, index):
+        self.calls.append("move")
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+    
+    def item(self, iid, values, tags):
+        self.calls.append("item")
+        self.rows[iid] = (values, tags)
+    
+    def delete(self, *iids):
+        self.calls.append("delete")
+        for iid in iids:
+            self.order.remove(iid)
+            del self.rows[iid]
+
+class SyncRowsTest(unittest.TestCase):
+    
+    def sync(self, tree, displayed_rows, tasks):
+        displayed_rows = sync_rows(tree, displayed_rows, tasks)
+        self.assertEqual(tree.order, [task.id for task in tasks])
+        self.assertEqual(list(displayed_rows), [task.id for task in tasks])
+        self.assertEqual(tree.rows, displayed_rows)
+        return displayed_rows
+    
+    def test_unchanged_rows_are_not_touched(self):
+        tasks = make_tasks(10)
+        tree = FakeTree()
+        displayed_rows = self.sync(tree, {}, tasks)
+        tree.calls.clear()
+        self.sync(tree, displayed_rows, tasks)
+        self.assertEqual(tree.calls, [])
+    
+    def test_only_changes_are_sent(self):
+        tasks = make_tasks(10)
+        tree = FakeTree()
+        displayed_rows = self.sync(tree, {}, tasks)
+        tree.calls.clear()
+        
+        tasks[3].completed = not tasks[3].completed
+        del tasks[5]
+        tasks.append(Task("Ajoutée", task_id="new"))
+        self.sync(tree, displayed_rows, tasks)
+        self.assertEqual(sorted(tree.calls), ["delete", "insert", "item"])
+    
+    def test_random_windows(self):
+        rng = random.Random(1)
+        tasks = make_tasks(40)
+        tree = FakeTree()
+        displayed_rows = {}
+        for _ in range(200):
+            window = rng.sample(tasks, rng.randint(0, 15))
+            for task in rng.sample(window, min(2, len(window))):
+                task.title += "!"
+            displayed_rows = self.sync(tree, displayed_rows, window)
+
+class QueryParityTest(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        storage = TaskStorage(os.path.join(cls.directory, "tasks.json"))
+        storage.compact(make_tasks(600, seed=2))
+        cls.memory = TaskStore(storage.load())
+        cls.memory.build_index()
+        cls.sqlite = SqliteTaskStore(os.path.join(cls.directory, "tasks.db"), import_from=storage)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.sqlite.close()
+        shutil.rmtree(cls.directory)
+    
+    def test_same_results(self):
+        searches = ["", "budget", "ré", "éq", "réunion client", "introuvable"]
+        date_ranges = [None, ("2025-01-03", "2025-02-12"), (None, "2025-01-05"), ("2025-02-01", None)]
+        for search, completed, date_range, sort, reverse in itertools.product(
+                searches, [None, True, False], date_ranges, [None, "title", "due_date", "status"], [False, True]):
+            criteria = (search, completed, date_range, sort, reverse)
+            with self.subTest(criteria=criteria):
+                expected = [task.id for task in self.memory.query(*criteria)]
+                results = self.sqlite.query(*criteria)
+                self.assertEqual([task.id for task in results], expected)
+                self.assertEqual(len(results), len(expected))
+                self.assertEqual([task.id for task in results[5:25]], expected[5:25])
+    
+    def test_same_results_after_changes(self):
+        memory = TaskStore(self.memory.tasks[:100])
+        sqlite = SqliteTaskStore(os.path.join(self.directory, "changes.db"))
+        self.addCleanup(sqlite.close)
+        for task in memory.tasks:
+            sqlite.add(task)
+        
+        task = memory.tasks[10]
+        task.title = "Budget révisé"
+        task.completed = not task.completed
+        memory.update(task)
+        sqlite.update(task)
+        memory.remove(memory.tasks[20].id)
+        sqlite.remove(sqlite.query()[20].id)
+        added = Task("Appel équipe", task_id="new")
+        added.due_date_str = "2025-01-04"
+        memory.add(added)
+        sqlite.add(added)
+        
+        for sort in [None, "title", "due_date", "status"]:
+            for search in ["", "budget"]:
+                with self.subTest(sort=sort, search=search):
+                    self.assertEqual([task.id for task in sqlite.query(search, sort=sort)],
+                                     [task.id for task in memory.query(search, sort=sort)])
+
+if __name__ == "__main__":
+    unittest.main()
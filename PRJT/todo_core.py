@@ -0,0 +1,860 @@
+# Cœur de la liste de tâches, sans interface graphique : modèle, index,
+# stockage et synchronisation des lignes du tableau. Utilisé par PRJT.PY et
+# par benchmark.py.
+import bisect
+import collections
+import contextlib
+import itertools
+import json
+from datetime import datetime
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+# Taille des morceaux lus par le chargement progressif de tasks.json (caractères)
+LOAD_CHUNK_SIZE = 1024 * 1024
+
+# Taille du journal au-delà de laquelle il est fusionné dans l'instantané (octets)
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+# Intervalle minimal entre deux écritures du thread d'enregistrement (ms)
+WRITER_FLUSH_INTERVAL_MS = 500
+# Délai maximal entre deux nouvelles tentatives après des échecs d'écriture (ms)
+WRITER_RETRY_MAX_MS = 30000
+
+# Mesures conservées par opération pour les statistiques glissantes du profileur
+PROFILE_WINDOW = 500
+# Nombre maximal d'événements gardés pour la trace
+PROFILE_TRACE_EVENTS = 100000
+
+class Task:
+    # Pas de __dict__ par instance, et la date limite reste une chaîne "AAAA-MM-JJ"
+    # tant qu'on n'a pas besoin de l'objet datetime
+    __slots__ = ("id", "title", "description", "completed", "due_date_str", "_due_date")
+    
+    def __init__(self, title, description="", due_date=None, completed=False, task_id=None):
+        # Identifiant permanent, utilisé comme iid dans le Treeview
+        self.id = task_id or uuid.uuid4().hex
+        self.title = title
+        self.description = description
+        self.due_date = due_date
+        self.completed = completed
+    
+    @property
+    def due_date(self):
+        # Analyse de la date seulement au premier accès
+        if self._due_date is None and self.due_date_str:
+            self._due_date = datetime.strptime(self.due_date_str, "%Y-%m-%d")
+        return self._due_date
+    
+    @due_date.setter
+    def due_date(self, value):
+        self._due_date = value
+        self.due_date_str = value.strftime("%Y-%m-%d") if value else None
+    
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "due_date": self.due_date_str,
+            "completed": self.completed
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        task = cls(
+            title=data["title"],
+            description=data["description"],
+            completed=data["completed"],
+            task_id=data.get("id")
+        )
+        task.due_date_str = data.get("due_date")
+        return task
+
+# Textes de recherche (titre et description en minuscules) rangés dans l'ordre de
+# TaskStore.tasks : une recherche est un simple parcours de cette liste de chaînes,
+# sans index par trigramme ni dictionnaire par id
+class SearchIndex:
+    
+    # Nombre de textes calculés entre deux vérifications du temps accordé à build
+    BUILD_STEP = 500
+    
+    def __init__(self, tasks):
+        self.tasks = tasks   # la liste de TaskStore, partagée
+        # texts[i] est le texte de tasks[i] ; les tâches au-delà de len(texts) ne
+        # sont pas encore indexées (voir build)
+        self.texts = []
+        # (requête, tâches, textes) de la dernière recherche, affinée quand la requête
+        # s'allonge ; oubliée à chaque modification
+        self.last = None
+    
+    def build(self, budget=None):
+        # Calcule les textes en attente pendant au plus budget secondes, retourne True quand tout est indexé
+        deadline = None if budget is None else time.perf_counter() + budget
+        tasks, texts = self.tasks, self.texts
+        while len(texts) < len(tasks):
+            texts.extend(self.task_text(task) for task in tasks[len(texts):len(texts) + self.BUILD_STEP])
+            self.last = None
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return len(texts) == len(tasks)
+    
+    @staticmethod
+    def task_text(task):
+        return f"{task.title}\n{task.description}".lower()
+    
+    def remove(self, index):
+        if index < len(self.texts):
+            del self.texts[index]
+        self.last = None
+    
+    def update(self, index, task):
+        if index < len(self.texts):
+            self.texts[index] = self.task_text(task)
+        self.last = None
+    
+    def search(self, query):
+        # Tâches dont le texte contient query (en minuscules), dans l'ordre de tasks
+        self.build()
+        last = self.last
+        if last is not None and last[0] == query:
+            return last[1]
+        if last is not None and last[0] in query:
+            # La requête s'est allongée : seul le résultat précédent est parcouru
+            _, tasks, texts = last
+        else:
+            tasks, texts = self.tasks, self.texts
+        keep = [query in text for text in texts]
+        self.last = (query, list(itertools.compress(tasks, keep)), list(itertools.compress(texts, keep)))
+        return self.last[1]
+
+# Lecture progressive d'un tableau JSON : renvoie les éléments un à un sans
+# charger tout le fichier
+def iter_json_array(f, chunk_size=LOAD_CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    started = False
+    while True:
+        # Sauter les blancs et les séparateurs entre les éléments
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("Le fichier ne contient pas une liste JSON")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Élément coupé en fin de morceau : lire la suite
+                if eof:
+                    raise
+            else:
+                # Un nombre coupé en fin de morceau se décode aussi ("12" pour 123456, "1" pour 1.5) :
+                # l'élément n'est accepté que suivi de "," ou "]", ou en fin de fichier
+                following = end
+                while following < len(buffer) and buffer[following] in " \t\r\n":
+                    following += 1
+                if eof or (following < len(buffer) and buffer[following] in ",]"):
+                    position = end
+                    yield item
+                    continue
+        elif eof:
+            if started:
+                raise ValueError("Liste JSON incomplète")
+            return
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+# Index trié des tâches selon value(task), puis leur id : le tri est tenu à jour à
+# chaque modification au lieu d'être refait à chaque rafraîchissement du tableau
+class SortedTaskIndex:
+    
+    def __init__(self, tasks_by_id):
+        self.tasks_by_id = tasks_by_id
+        # Liste triée de (valeur, id, tâche), construite à la première utilisation ; les id
+        # étant uniques, les tâches elles-mêmes ne sont jamais comparées
+        self.entries = None
+        self.keys = {}        # id -> entrée actuellement dans entries
+        self.all_tasks = None # toutes les tâches dans l'ordre, gardées jusqu'à la prochaine modification
+    
+    def value(self, task):
+        raise NotImplementedError
+    
+    def entry(self, task):
+        return (self.value(task), task.id, task)
+    
+    def build(self):
+        self.keys = {task.id: self.entry(task) for task in self.tasks_by_id.values()}
+        self.entries = sorted(self.keys.values())
+        self.all_tasks = None
+    
+    def add(self, task):
+        if self.entries is None:
+            return
+        entry = self.entry(task)
+        self.keys[task.id] = entry
+        bisect.insort(self.entries, entry)
+        self.all_tasks = None
+    
+    def remove(self, task_id):
+        if self.entries is None:
+            return
+        entry = self.keys.pop(task_id, None)
+        if entry is not None:
+            del self.entries[bisect.bisect_left(self.entries, entry)]
+            self.all_tasks = None
+    
+    def update(self, task):
+        if self.entries is not None and self.keys[task.id][0] != self.value(task):
+            self.remove(task.id)
+            self.add(task)
+    
+    def ordered(self):
+        # Toutes les tâches dans l'ordre de l'index
+        if self.entries is None:
+            self.build()
+        if self.all_tasks is None:
+            self.all_tasks = self.tasks(0, len(self.entries))
+        return self.all_tasks
+    
+    def tasks(self, low, high):
+        return [entry[2] for entry in self.entries[low:high]]
+
+# Index par date limite : les filtres d'échéance sont des recherches par bisection
+# et le tri par date un simple parcours
+class DueDateIndex(SortedTaskIndex):
+    
+    # Les tâches sans date sont rangées après toutes les dates
+    NO_DATE = "~"
+    
+    def value(self, task):
+        return task.due_date_str or self.NO_DATE
+    
+    def range(self, start=None, end=None):
+        # Tâches dont la date limite est comprise entre start et end (inclus, "AAAA-MM-JJ"),
+        # par date croissante ; None laisse la borne ouverte, les tâches sans date sont exclues
+        if self.entries is None:
+            self.build()
+        low = 0 if start is None else bisect.bisect_left(self.entries, (start,))
+        high = bisect.bisect_left(self.entries, (end or self.NO_DATE, "\uffff" if end else ""))
+        return self.tasks(low, high)
+
+# Index par titre, sans tenir compte de la casse
+class TitleIndex(SortedTaskIndex):
+    
+    def value(self, task):
+        return task.title.lower()
+
+# Tâches en mémoire, chargées depuis TaskStorage
+class TaskStore:
+    
+    def __init__(self, tasks=()):
+        self.tasks = list(tasks)
+        self.tasks_by_id = {task.id: task for task in self.tasks}
+        self.search_index = SearchIndex(self.tasks)
+        self.due_index = DueDateIndex(self.tasks_by_id)
+        self.title_index = TitleIndex(self.tasks_by_id)
+    
+    def __len__(self):
+        return len(self.tasks)
+    
+    def build_index(self, budget=None):
+        return self.search_index.build(budget)
+    
+    def get(self, task_id):
+        return self.tasks_by_id[task_id]
+    
+    def add(self, task):
+        self.tasks.append(task)
+        self.tasks_by_id[task.id] = task
+        self.due_index.add(task)
+        self.title_index.add(task)
+    
+    def extend(self, tasks):
+        # Ajout en masse pendant le chargement : l'indexation est différée
+        self.tasks.extend(tasks)
+        self.tasks_by_id.update((task.id, task) for task in tasks)
+        for task in tasks:
+            self.due_index.add(task)
+            self.title_index.add(task)
+    
+    def update(self, task):
+        # Une tâche supprimée pendant que sa fenêtre d'édition était ouverte ne revient pas dans les index
+        if task.id not in self.tasks_by_id:
+            return
+        self.search_index.update(self.tasks.index(self.tasks_by_id[task.id]), task)
+        self.due_index.update(task)
+        self.title_index.update(task)
+    
+    def remove(self, task_id):
+        task = self.tasks_by_id.pop(task_id)
+        index = self.tasks.index(task)
+        del self.tasks[index]
+        self.search_index.remove(index)
+        self.due_index.remove(task_id)
+        self.title_index.remove(task_id)
+        return task
+    
+    def query(self, search="", completed=None, date_range=None, sort=None, reverse=False):
+        # Un filtre d'échéance ou le tri par date ou par titre partent d'un index déjà
+        # dans l'ordre voulu : pas de tri de toute la liste
+        if date_range is not None:
+            filtered = self.due_index.range(*date_range)
+        elif sort == "due_date":
+            filtered = self.due_index.ordered()
+        elif sort == "title":
+            filtered = self.title_index.ordered()
+        else:
+            filtered = self.tasks
+        
+        # Filtrer par terme de recherche : le résultat de l'index est dans l'ordre de self.tasks
+        if search:
+            matches = self.search_index.search(search.lower())
+            if filtered is self.tasks:
+                filtered = matches
+            else:
+                matches = set(matches)
+                filtered = [task for task in filtered if task in matches]
+        
+        # Filtrer par statut
+        if completed is not None:
+            filtered = [task for task in filtered if task.completed == completed]
+        
+        if sort == "title" and date_range is not None:
+            # Seules les tâches de la période sont triées
+            filtered = sorted(filtered, key=lambda task: task.title.lower())
+        elif sort == "status" and completed is None:
+            # Tri stable sur un booléen : les tâches en cours, puis les terminées
+            filtered = [task for task in filtered if not task.completed] + [task for task in filtered if task.completed]
+        if reverse:
+            filtered = filtered[::-1]
+        return filtered
+    
+    def close(self):
+        pass
+
+# Stockage des tâches : un instantané JSON (même format que l'ancien tasks.json)
+# et un journal où chaque modification ajoute une ligne JSON
+class TaskStorage:
+    
+    def __init__(self, filename):
+        self.filename = filename
+        self.journal_filename = filename + ".journal"
+        self.journal_intact = True
+    
+    def exists(self):
+        return os.path.exists(self.filename) or os.path.exists(self.journal_filename)
+    
+    def iter_snapshot(self):
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, "r", encoding="utf-8") as f:
+            yield from iter_json_array(f)
+    
+    def read_journal(self):
+        # Retourne les enregistrements valides ; journal_intact indique si le journal est sain
+        records = []
+        self.journal_intact = True
+        if not os.path.exists(self.journal_filename):
+            return records
+        with open(self.journal_filename, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Dernière ligne tronquée par un arrêt brutal : on l'ignore
+                    self.journal_intact = False
+                    break
+        return records
+    
+    def journal_size(self):
+        try:
+            return os.path.getsize(self.journal_filename)
+        except OSError:
+            return 0
+    
+    def iter_tasks(self):
+        # Le journal est lu en premier (sa taille est bornée) : son dernier état
+        # pour chaque id remplace ou supprime la tâche de l'instantané au passage
+        changes = {}
+        for record in self.read_journal():
+            if record["op"] == "put":
+                changes[record["task"]["id"]] = record["task"]
+            elif record["op"] == "delete":
+                changes[record["id"]] = None
+        
+        for index, task_dict in enumerate(self.iter_snapshot()):
+            if "id" not in task_dict:
+                # Ancien fichier sans identifiants : id dérivé de la position, stable
+                # d'une lecture à l'autre jusqu'à la prochaine compaction
+                task_dict["id"] = f"{index:08x}"
+            task_dict = changes.pop(task_dict["id"], task_dict)
+            if task_dict is not None:
+                yield Task.from_dict(task_dict)
+        
+        # Tâches créées depuis le dernier instantané
+        for task_dict in changes.values():
+            if task_dict is not None:
+                yield Task.from_dict(task_dict)
+    
+    def load(self):
+        return list(self.iter_tasks())
+    
+    def append(self, changes):
+        # changes : id -> dictionnaire de la tâche, ou None pour une suppression
+        lines = []
+        for task_id, task_dict in changes.items():
+            if task_dict is None:
+                lines.append(json.dumps({"op": "delete", "id": task_id}))
+            else:
+                lines.append(json.dumps({"op": "put", "task": task_dict}, ensure_ascii=False))
+        with open(self.journal_filename, "a", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def needs_compaction(self):
+        # Un journal tronqué doit être réécrit pour que les ajouts suivants ne soient pas collés à la ligne abîmée
+        return not self.journal_intact or self.journal_size() > JOURNAL_COMPACT_BYTES
+    
+    def compact(self, tasks=None):
+        if tasks is None:
+            tasks = self.iter_tasks()
+        # Écrire le nouvel instantané à côté, une tâche par ligne, puis le renommer de façon atomique
+        temp_filename = self.filename + ".tmp"
+        with open(temp_filename, "w", encoding="utf-8") as f:
+            f.write("[")
+            for index, task in enumerate(tasks):
+                f.write(",\n  " if index else "\n  ")
+                f.write(json.dumps(task.to_dict(), ensure_ascii=False))
+            f.write("\n]\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_filename, self.filename)
+        # Rejouer un journal déjà fusionné ne change rien : le vider en dernier suffit
+        if os.path.exists(self.journal_filename):
+            open(self.journal_filename, "w").close()
+        self.journal_intact = True
+
+# Thread d'enregistrement : regroupe les modifications en attente et les écrit
+# au plus une fois par intervalle, sans bloquer la boucle Tk
+class TaskWriter(threading.Thread):
+    
+    def __init__(self, storage, interval_ms=WRITER_FLUSH_INTERVAL_MS, profiler=None):
+        super().__init__(name="TaskWriter", daemon=True)
+        self.storage = storage
+        self.profiler = profiler or Profiler()
+        self.interval = interval_ms / 1000
+        self.condition = threading.Condition()
+        self.pending = {}   # id -> dictionnaire de la tâche, ou None pour une suppression
+        self.closing = False
+        # Écritures suspendues (voir pause) ; les modifications continuent de s'accumuler
+        self.paused = False
+        # Attente avant la prochaine tentative, doublée à chaque échec consécutif (s)
+        self.retry_delay = 0
+        # (True, nombre de modifications écrites) ou (False, message d'erreur), lus par l'interface
+        self.results = queue.Queue()
+    
+    def submit(self, updated=(), deleted=()):
+        # La sérialisation se fait ici, dans le thread Tk, pour écrire un état cohérent
+        changes = {task.id: task.to_dict() for task in updated}
+        changes.update((task_id, None) for task_id in deleted)
+        with self.condition:
+            self.pending.update(changes)
+            self.condition.notify()
+    
+    def run(self):
+        while True:
+            with self.condition:
+                while (not self.pending or self.paused) and not self.closing:
+                    self.condition.wait()
+                # Laisser les modifications rapprochées s'accumuler jusqu'à la fin de l'intervalle,
+                # ou du délai de nouvelle tentative après un échec
+                deadline = time.monotonic() + max(self.interval, self.retry_delay)
+                while not self.closing and time.monotonic() < deadline:
+                    self.condition.wait(deadline - time.monotonic())
+                changes, self.pending = self.pending, {}
+                closing = self.closing
+            if changes:
+                with self.profiler.measure("write"):
+                    self.flush(changes)
+            if closing:
+                return
+    
+    def flush(self, changes):
+        try:
+            if not self.storage.journal_intact:
+                self.storage.compact()
+            self.storage.append(changes)
+            if self.storage.needs_compaction():
+                self.storage.compact()
+            self.retry_delay = 0
+            self.results.put((True, len(changes)))
+        except Exception as e:
+            # Remettre les modifications en attente sans écraser les plus récentes
+            with self.condition:
+                for task_id, task_dict in changes.items():
+                    self.pending.setdefault(task_id, task_dict)
+            self.retry_delay = min(max(self.interval, self.retry_delay * 2), WRITER_RETRY_MAX_MS / 1000)
+            self.results.put((False, str(e)))
+    
+    def pause(self):
+        # Pendant le chargement progressif, l'instantané est encore ouvert en lecture :
+        # la compaction ne doit pas le remplacer (Windows refuse os.replace sur un fichier ouvert)
+        with self.condition:
+            self.paused = True
+    
+    def resume(self):
+        with self.condition:
+            self.paused = False
+            self.condition.notify()
+    
+    def retry(self):
+        # Après close, nouvelle tentative d'écrire ce qui reste, dans le thread appelant
+        changes, self.pending = self.pending, {}
+        if changes:
+            self.flush(changes)
+    
+    def close(self):
+        # Écrire tout ce qui reste avant de rendre la main
+        with self.condition:
+            self.closing = True
+            self.condition.notify()
+        self.join()
+
+# Tâches dans une base SQLite : rien n'est chargé au démarrage, les filtres et
+# la recherche deviennent des requêtes qui ne renvoient que les lignes utiles
+class SqliteTaskStore:
+    
+    COLUMNS = "id, title, description, due_date, completed"
+    # Valeur de PRAGMA user_version une fois tasks.json importé
+    IMPORTED_VERSION = 1
+    
+    def __init__(self, filename, import_from=None):
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.create_function("py_lower", 1, lambda text: text.lower(), deterministic=True)
+        with self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL UNIQUE,
+                    title TEXT NOT NULL,
+                    description TEXT NOT NULL DEFAULT '',
+                    due_date TEXT,
+                    completed INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS tasks_completed ON tasks(completed, seq);
+                DROP INDEX IF EXISTS tasks_due_date;
+                CREATE INDEX IF NOT EXISTS tasks_due_range ON tasks(due_date, id);
+                CREATE INDEX IF NOT EXISTS tasks_due_order ON tasks(due_date IS NULL, due_date, id);
+                DROP INDEX IF EXISTS tasks_title;
+                CREATE INDEX IF NOT EXISTS tasks_title_order ON tasks(title COLLATE NOCASE, id);
+                CREATE INDEX IF NOT EXISTS tasks_completed_due_range ON tasks(completed, due_date, id);
+                CREATE INDEX IF NOT EXISTS tasks_completed_due_order ON tasks(completed, due_date IS NULL, due_date, id);
+                CREATE INDEX IF NOT EXISTS tasks_completed_title ON tasks(completed, title COLLATE NOCASE, id);
+            """)
+        self.fts = self.create_fts()
+        
+        # Première ouverture : reprendre les tâches du fichier JSON existant. user_version
+        # retient que c'est fait, pour qu'une base vidée par l'utilisateur le reste
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] < self.IMPORTED_VERSION:
+            with self.connection:
+                if import_from is not None and len(self) == 0 and import_from.exists():
+                    self.connection.executemany(
+                        f"INSERT INTO tasks ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                        (self.task_params(task) for task in import_from.iter_tasks()))
+                self.connection.execute(f"PRAGMA user_version = {self.IMPORTED_VERSION}")
+    
+    def create_fts(self):
+        # La recherche plein texte utilise le tokenizer trigram (SQLite >= 3.34) pour
+        # garder la recherche par sous-chaîne ; sans lui on se rabat sur LIKE
+        try:
+            with self.connection:
+                self.connection.executescript("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                        title, description, content='tasks', content_rowid='seq', tokenize='trigram'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+                        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.seq, new.title, new.description);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+                        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+                        VALUES ('delete', old.seq, old.title, old.description);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+                        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+                        VALUES ('delete', old.seq, old.title, old.description);
+                        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.seq, new.title, new.description);
+                    END;
+                """)
+            return True
+        except sqlite3.OperationalError:
+            return False
+    
+    @staticmethod
+    def task_params(task):
+        return task.id, task.title, task.description, task.due_date_str, int(task.completed)
+    
+    @staticmethod
+    def row_to_task(row):
+        task_id, title, description, due_date_str, completed = row
+        task = Task(title, description, None, bool(completed), task_id)
+        task.due_date_str = due_date_str
+        return task
+    
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    
+    def build_index(self, budget=None):
+        return True
+    
+    def get(self, task_id):
+        row = self.connection.execute(f"SELECT {self.COLUMNS} FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            raise KeyError(task_id)
+        return self.row_to_task(row)
+    
+    def add(self, task):
+        with self.connection:
+            self.connection.execute(f"INSERT INTO tasks ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?)", self.task_params(task))
+    
+    def update(self, task):
+        task_id, title, description, due_date_str, completed = self.task_params(task)
+        with self.connection:
+            self.connection.execute(
+                "UPDATE tasks SET title = ?, description = ?, due_date = ?, completed = ? WHERE id = ?",
+                (title, description, due_date_str, completed, task_id))
+    
+    def remove(self, task_id):
+        task = self.get(task_id)
+        with self.connection:
+            self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        return task
+    
+    # Tri -> colonnes ORDER BY, chacune couverte par un index pour que le tableau lise
+    # une fenêtre sans trier toute la table ; entre égaux, id départage les dates et les
+    # titres comme les index de TaskStore, et seq garde l'ordre de création
+    SORT_ORDERS = {
+        None: ["seq"],
+        "title": ["title COLLATE NOCASE", "id"],
+        "due_date": ["due_date IS NULL", "due_date", "id"],
+        "status": ["completed", "seq"],
+    }
+    
+    def where_clause(self, search, completed, date_range):
+        clauses, params = [], []
+        if search:
+            if self.fts and len(search) >= 3:
+                clauses.append("seq IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)")
+                params.append('"' + search.replace('"', '""') + '"')
+            else:
+                # LIKE et lower() de SQLite ne changent la casse que des lettres ASCII : comparer avec
+                # str.lower, comme SearchIndex, pour que "éc" trouve "École"
+                clauses.append("instr(py_lower(title || char(10) || description), ?) > 0")
+                params.append(search.lower())
+        if completed is not None:
+            clauses.append("completed = ?")
+            params.append(int(completed))
+        if date_range is not None:
+            start, end = date_range
+            if start is not None:
+                clauses.append("due_date >= ?")
+                params.append(start)
+            if end is not None:
+                clauses.append("due_date <= ?")
+                params.append(end)
+            if start is None and end is None:
+                clauses.append("due_date IS NOT NULL")
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+    
+    def count(self, search="", completed=None, date_range=None):
+        where, params = self.where_clause(search, completed, date_range)
+        return self.connection.execute(f"SELECT COUNT(*) FROM tasks{where}", params).fetchone()[0]
+    
+    def query(self, search="", completed=None, date_range=None, sort=None, reverse=False):
+        order = self.SORT_ORDERS[sort]
+        if date_range is not None:
+            # Comme TaskStore, un filtre d'échéance part des tâches dans l'ordre des dates ;
+            # les tâches sans date étant exclues, tasks_due_range sert au filtre et au tri
+            order = (order[:-1] if sort in ("title", "status") else []) + ["due_date", "id"]
+        if reverse:
+            order = [column + " DESC" for column in order]
+        return SqliteResults(self, (search, completed, date_range), ", ".join(order))
+    
+    def fetch(self, criteria, order, offset=0, limit=-1):
+        where, params = self.where_clause(*criteria)
+        rows = self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM tasks{where} ORDER BY {order} LIMIT ? OFFSET ?", params + [limit, offset])
+        return [self.row_to_task(row) for row in rows]
+    
+    def contains(self, criteria, task_id):
+        where, params = self.where_clause(*criteria)
+        where += " AND id = ?" if where else " WHERE id = ?"
+        return self.connection.execute(f"SELECT 1 FROM tasks{where}", params + [task_id]).fetchone() is not None
+    
+    def close(self):
+        self.connection.close()
+
+# Résultat d'une requête SQLite vu comme une séquence : la longueur et les
+# tranches demandées par le tableau sont lues à la demande
+class SqliteResults:
+    
+    FETCH_SIZE = 500
+    
+    def __init__(self, store, criteria, order):
+        self.store = store
+        self.criteria = criteria   # (search, completed, date_range)
+        self.order = order
+        self.length = None
+        self.page = (0, [])   # (position, lignes) de la dernière page lue
+    
+    def __len__(self):
+        if self.length is None:
+            self.length = self.store.count(*self.criteria)
+        return self.length
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, _ = index.indices(len(self))
+            return self.rows(start, max(start, stop))
+        if index < 0:
+            index += len(self)
+        rows = self.rows(index, index + 1) if index >= 0 else []
+        if not rows:
+            raise IndexError(index)
+        return rows[0]
+    
+    def rows(self, start, stop):
+        # Lecture par pages de FETCH_SIZE lignes : faire défiler le tableau ne relance pas
+        # la requête tant que la fenêtre reste dans la page déjà lue
+        page_start, page = self.page
+        if start < page_start or stop > page_start + len(page):
+            page_start = start - start % self.FETCH_SIZE
+            page = self.store.fetch(self.criteria, self.order, page_start, max(self.FETCH_SIZE, stop - page_start))
+            self.page = (page_start, page)
+        return page[start - page_start:stop - page_start]
+    
+    def __contains__(self, task):
+        return self.store.contains(self.criteria, task.id)
+    
+    def __iter__(self):
+        for start in range(0, len(self), self.FETCH_SIZE):
+            yield from self[start:start + self.FETCH_SIZE]
+
+# Profileur des opérations de l'application, désactivé par défaut : durées
+# glissantes par opération (p50/p95/max) et événements au format Chrome trace
+# (chrome://tracing, Perfetto)
+class Profiler:
+    
+    def __init__(self, enabled=False, window=PROFILE_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self.samples = {}   # nom -> durées récentes (s)
+        self.events = collections.deque(maxlen=PROFILE_TRACE_EVENTS)
+        self.last = None    # (nom, durée en s) de la dernière opération terminée
+        self.origin = time.perf_counter()
+    
+    @contextlib.contextmanager
+    def measure(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+    
+    def record(self, name, start, end):
+        duration = end - start
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = collections.deque(maxlen=self.window)
+        samples.append(duration)
+        self.events.append({
+            "name": name,
+            "ph": "X",
+            "ts": (start - self.origin) * 1e6,
+            "dur": duration * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        })
+        self.last = (name, duration)
+    
+    def stats(self):
+        # nom -> {"count", "p50", "p95", "max"}, durées en ms
+        stats = {}
+        for name, samples in list(self.samples.items()):
+            ordered = sorted(samples)
+            if not ordered:
+                continue
+            def percentile(fraction):
+                return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))] * 1000
+            stats[name] = {"count": len(ordered), "p50": percentile(0.5), "p95": percentile(0.95), "max": ordered[-1] * 1000}
+        return stats
+    
+    def dump_trace(self, filename):
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": list(self.events), "displayTimeUnit": "ms"}, f)
+
+# Valeurs et tags d'une ligne du tableau pour une tâche
+def task_row(task):
+    status = "Terminé" if task.completed else "En cours"
+    values = (task.title, 
+             task.description if len(task.description) < 50 else task.description[:47] + "...", 
+             task.due_date_str or "", 
+             status)
+    tags = ("completed",) if task.completed else ()
+    return values, tags
+
+# Met le Treeview (ou tout objet offrant insert/move/item/delete) en accord avec
+# tasks en ne touchant que les lignes qui ont changé. displayed_rows associe
+# chaque iid affiché à (values, tags) dans l'ordre du tableau ; la fonction
+# retourne le nouveau dictionnaire.
+def sync_rows(tree, displayed_rows, tasks):
+    wanted = {task.id for task in tasks}
+    
+    # Supprimer les lignes sorties de la fenêtre ou du filtre
+    removed = [iid for iid in displayed_rows if iid not in wanted]
+    if removed:
+        tree.delete(*removed)
+    
+    # Insérer, mettre à jour ou déplacer uniquement les lignes qui ont changé.
+    # previous contient les lignes restantes dans leur ordre d'affichage actuel :
+    # après avoir placé index lignes, la première ligne non placée est à la position index.
+    previous = [iid for iid in displayed_rows if iid in wanted]
+    placed = set()
+    position = 0
+    rows = {}
+    for index, task in enumerate(tasks):
+        while position < len(previous) and previous[position] in placed:
+            position += 1
+        row = task_row(task)
+        rows[task.id] = row
+        old_row = displayed_rows.get(task.id)
+        if old_row is None:
+            tree.insert("", index, iid=task.id, values=row[0], tags=row[1])
+        else:
+            if position < len(previous) and previous[position] == task.id:
+                position += 1
+            else:
+                tree.move(task.id, "", index)
+            if old_row != row:
+                tree.item(task.id, values=row[0], tags=row[1])
+        placed.add(task.id)
+    return rows